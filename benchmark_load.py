@@ -0,0 +1,107 @@
+# benchmark_load.py
+# Compares load_from_json (with validation) against the original, unvalidated
+# load path on a generated students file.
+#
+#   python benchmark_load.py [num_students] [grades_per_student]
+import contextlib
+import gc
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from data_manager import load_from_json
+from student_grade_analyzer import Student
+
+
+class PlainStudent:
+    def __init__(self, name, grades=None):
+        self.name = name
+        self.grades = grades if grades is not None else []
+
+
+def baseline_load(filename, StudentClass):
+    # the load path before validation existed: parse and construct, no checks
+    with open(filename, "r") as f:
+        data = json.load(f)
+
+    students = {}
+    for entry in data.get("students", []):
+        name = entry.get("name")
+        grades = entry.get("grades", [])
+        if name:
+            students[name] = StudentClass(name, grades)
+    return students
+
+
+def make_file(path, num_students, per_student, all_floats):
+    rng = random.Random(0)
+    students = []
+    for i in range(num_students):
+        grades = []
+        for _ in range(per_student):
+            if all_floats or rng.random() < 0.5:
+                grades.append(round(rng.uniform(0, 100), 1))
+            else:
+                grades.append(rng.randint(0, 100))
+        students.append({"name": f"Student {i}", "grades": grades})
+
+    with open(path, "w") as f:
+        json.dump({"students": students}, f, indent=4)
+
+
+def baseline_load_gc_paused(filename, StudentClass):
+    # same as baseline_load, with the GC pause load_from_json uses, so the
+    # remaining difference is the cost of validation alone
+    gc.disable()
+    try:
+        return baseline_load(filename, StudentClass)
+    finally:
+        gc.enable()
+
+
+def best_of(funcs, repeat=21):
+    # runs are interleaved so background noise hits every variant alike
+    times = [[] for _ in funcs]
+    for _ in range(repeat):
+        for i, func in enumerate(funcs):
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                func()
+            times[i].append(time.perf_counter() - start)
+    return [min(t) for t in times]
+
+
+def main():
+    num_students = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    per_student = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    total = num_students * per_student
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, all_floats in (("mixed int/float grades", False), ("all-float grades", True)):
+            path = os.path.join(tmp, "students.json")
+            make_file(path, num_students, per_student, all_floats)
+
+            base, base_nogc, new, full = best_of([
+                lambda: baseline_load(path, PlainStudent),
+                lambda: baseline_load_gc_paused(path, PlainStudent),
+                lambda: load_from_json(path, PlainStudent),
+                lambda: load_from_json(path, Student),
+            ])
+
+            print(f"{num_students} students x {per_student} = {total} grades, {label}")
+            print("-" * 60)
+            print(f"baseline load (no validation):    {base:.3f}s")
+            print(f"baseline load, GC paused:         {base_nogc:.3f}s")
+            print(f"load_from_json (validated):       {new:.3f}s  "
+                  f"({100 * (new - base) / base:+.0f}% vs baseline, "
+                  f"{100 * (new - base_nogc) / base_nogc:+.0f}% vs GC-paused baseline)")
+            print(f"load_from_json with Student:      {full:.3f}s")
+            print()
+
+
+if __name__ == "__main__":
+    main()
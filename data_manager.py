@@ -1,4 +1,20 @@
+import gc
 import json
+import os
+from itertools import chain
+
+from utils import NUMERIC_TYPES
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional: fall back to the stdlib columnar format
+    pa = None
+    pq = None
+
+GRADE_COLUMNS = ["name", "grade_index", "grade"]
+SUMMARY_COLUMNS = ["name", "count", "average", "highest", "lowest", "median"]
+ROW_GROUP_SIZE = 10000
 
 def save_to_json(filename, students_dict):
     data = {"students": []}
@@ -15,22 +31,225 @@ def save_to_json(filename, students_dict):
     print(f"Data successfully saved to {filename}")
 
 
-def load_from_json(filename, StudentClass):
-    try:
-        with open(filename, "r") as f:
-            data = json.load(f)
+# ---------- Load-time validation ----------
+#
+# Modes:
+#   strict      any problem aborts the load (nothing is returned)
+#   lenient     bad grades and bad/duplicate records are dropped, the rest loads
+#   quarantine  (default) every record with a problem is left out as a whole and written
+#               to <file>_quarantine.json for fixing later
+VALIDATION_MODES = ("strict", "lenient", "quarantine")
+MAX_PRINTED_ERRORS = 20
+
+def _coerce_grade(g):
+    # returns a float in 0-100, or None if the value can't be used as a grade
+    if type(g) is bool:
+        return None
+    if type(g) is str:
+        try:
+            g = float(g)
+        except ValueError:
+            return None
+    elif type(g) not in NUMERIC_TYPES:
+        return None
+    g = float(g)
+    if not (0 <= g <= 100):  # also rejects NaN
+        return None
+    return g
 
-        students = {}
 
-        # Expecting: {"students": [ {name:..., grades:...}, ... ]}
-        students_list = data.get("students", [])
+def _normalize_grades(grades):
+    """Return (floats, bad) where bad lists (position, value) of rejected grades."""
+    # fast path: plain numbers already in range, checked with C-level builtins
+    types = set(map(type, grades))
+    if types <= NUMERIC_TYPES:
+        floats = grades if types == {float} else list(map(float, grades))
+        if not floats or (min(floats) >= 0 and max(floats) <= 100):
+            return floats, []
 
-        for entry in students_list:
+    floats = []
+    bad = []
+    for i, g in enumerate(grades, start=1):
+        value = _coerce_grade(g)
+        if value is None:
+            bad.append((i, g))
+        else:
+            floats.append(value)
+    return floats, bad
+
+
+def _grades_ok(flat):
+    # one check over every grade in the file; numbers were already parsed as floats
+    if not set(map(type, flat)) <= {float}:
+        return False
+    return not flat or (min(flat) >= 0 and max(flat) <= 100)
+
+
+def validate_students(text, mode="lenient"):
+    """Validate and normalize a students JSON document in a single pass.
+
+    Returns (records, errors, quarantined): records is a list of
+    (name, float_grades) ready to build students from, errors a list of
+    messages naming the record index, student and grade position,
+    quarantined the raw records that were set aside (quarantine mode only).
+    Structural JSON problems raise json.JSONDecodeError.
+    """
+    if mode not in VALIDATION_MODES:
+        raise ValueError(f"Unknown validation mode: {mode}")
+
+    # Ints are parsed straight to floats (no conversion pass afterwards);
+    # NaN/Infinity literals come back as strings so they fail the numeric checks.
+    data = json.loads(text, parse_int=float, parse_constant=str)
+    if not isinstance(data, dict):
+        raise json.JSONDecodeError("Expecting an object at the top level", text, 0)
+    entries = data.get("students", [])
+    if not isinstance(entries, list):
+        raise json.JSONDecodeError('"students" must be a list', text, 0)
+
+    records = []   # [name, grades]; name is set to None if the record is dropped later
+    pending = []   # (index, entry, record) whose grades still need checking
+    failures = []  # (index, name, problems)
+    quarantined = []
+    seen = set()
+
+    # Pass 1: record structure only. Grades are checked in bulk afterwards.
+    for index, entry in enumerate(entries):
+        problems = []
+        name = None
+        raw_grades = None
+        duplicate = False
+
+        if not isinstance(entry, dict):
+            problems.append("record is not an object")
+        else:
             name = entry.get("name")
-            grades = entry.get("grades", [])
-            
-            if name:
+            raw_grades = entry.get("grades", [])
+
+            if not isinstance(name, str) or not name.strip():
+                problems.append("missing or invalid name")
+                name = None
+            elif name in seen:
+                problems.append(f"duplicate name '{name}'")
+                duplicate = True
+            else:
+                seen.add(name)
+
+            if not isinstance(raw_grades, list):
+                problems.append(f"grades is {type(raw_grades).__name__}, expected a list")
+                raw_grades = None
+
+        if not problems:
+            record = [name, raw_grades]
+            records.append(record)
+            pending.append((index, entry, record))
+            continue
+
+        grades = []
+        if raw_grades is not None:
+            grades, bad = _normalize_grades(raw_grades)
+            problems.extend(f"grade #{i} {g!r} is not a number in 0-100" for i, g in bad)
+        failures.append((index, name, problems))
+
+        if mode == "quarantine":
+            quarantined.append(entry)
+        elif mode == "lenient" and name is not None and not duplicate:
+            # keep whatever is salvageable from the record
+            records.append([name, grades])
+
+    # Pass 2: every grade of the well-formed records at once, using C builtins.
+    flat = list(chain.from_iterable(r[1] for _, _, r in pending))
+    if not _grades_ok(flat):
+        # something is wrong somewhere: find it record by record
+        for index, entry, record in pending:
+            grades, bad = _normalize_grades(record[1])
+            record[1] = grades
+            if not bad:
+                continue
+            failures.append((index, record[0], [f"grade #{i} {g!r} is not a number in 0-100" for i, g in bad]))
+            if mode == "quarantine":
+                quarantined.append(entry)
+                record[0] = None
+        failures.sort(key=lambda f: f[0])
+
+    errors = []
+    for index, name, problems in failures:
+        label = f"students[{index}]" + (f" '{name}'" if name else "")
+        errors.extend(f"{label}: {p}" for p in problems)
+
+    records = [(name, grades) for name, grades in records if name is not None]
+    return records, errors, quarantined
+
+
+def quarantine_path(filename):
+    return os.path.splitext(filename)[0] + "_quarantine.json"
+
+
+def _write_quarantine(qfile, quarantined, errors):
+    # add to what earlier loads set aside instead of replacing it; a record that
+    # is already there (same content) is not stored twice
+    data = {"students": [], "errors": []}
+    if os.path.exists(qfile):
+        with open(qfile, "r") as f:
+            data = json.load(f)
+
+    known = {json.dumps(r, sort_keys=True) for r in data.get("students", [])}
+    for record in quarantined:
+        key = json.dumps(record, sort_keys=True)
+        if key not in known:
+            known.add(key)
+            data.setdefault("students", []).append(record)
+
+    old_errors = set(data.get("errors", []))
+    data.setdefault("errors", []).extend(e for e in errors if e not in old_errors)
+
+    with open(qfile, "w") as f:
+        json.dump(data, f, indent=4)
+
+
+def load_from_json(filename, StudentClass, mode="quarantine", errors=None):
+    # errors: optional list that receives the validation messages, for callers
+    # (like the GUI) that need to show them somewhere other than stdout
+    try:
+        with open(filename, "r") as f:
+            text = f.read()
+
+        # Loading creates many containers but no reference cycles, so pause the
+        # cyclic GC instead of letting it re-walk the freshly parsed data.
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            # Expecting: {"students": [ {name:..., grades:...}, ... ]}
+            records, problems, quarantined = validate_students(text, mode)
+            students = {}
+            for name, grades in records:
                 students[name] = StudentClass(name, grades)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+        if errors is not None:
+            errors.extend(problems)
+
+        if problems:
+            print(f"{len(problems)} problem(s) found in {filename}:")
+            for e in problems[:MAX_PRINTED_ERRORS]:
+                print(f"  {e}")
+            if len(problems) > MAX_PRINTED_ERRORS:
+                print(f"  ... and {len(problems) - MAX_PRINTED_ERRORS} more")
+
+            if mode == "strict":
+                print("Load aborted (strict mode).")
+                return None
+
+        if quarantined:
+            qfile = quarantine_path(filename)
+            try:
+                _write_quarantine(qfile, quarantined, problems)
+            except (OSError, json.JSONDecodeError) as e:
+                # without a quarantine copy, loading would lose those records on the next save
+                print(f"Could not write quarantine file {qfile} ({e}); load aborted.")
+                return None
+            print(f"{len(quarantined)} record(s) quarantined to {qfile}")
 
         print(f"Data successfully loaded from {filename}")
         return students
@@ -39,6 +258,166 @@ def load_from_json(filename, StudentClass):
         print("JSON file not found.")
         return None
 
-    except json.JSONDecodeError:
-        print("Error reading JSON file.")
-        return None
\ No newline at end of file
+    except json.JSONDecodeError as e:
+        print(f"Error reading JSON file: {e}")
+        return None
+
+
+# ---------- Columnar snapshots (analytics handoff) ----------
+#
+# Two tables are written next to each other:
+#   <base>_grades   one row per grade: name, grade_index, grade
+#   <base>_summary  one row per student: name, count, average, highest, lowest, median
+# With pyarrow they are Parquet files; otherwise each file is JSON lines where
+# the first line is a header and every following line is one row group stored
+# column-wise ({"name": [...], "grade_index": [...], "grade": [...]}).
+
+def _columnar_paths(base, use_parquet):
+    ext = ".parquet" if use_parquet else ".cols.jsonl"
+    return base + "_grades" + ext, base + "_summary" + ext
+
+
+class _ColumnarWriter:
+    """Buffers rows and flushes them as row groups so memory stays bounded."""
+
+    def __init__(self, path, columns, schema=None, row_group_size=ROW_GROUP_SIZE):
+        self.columns = columns
+        self.row_group_size = row_group_size
+        self.buffer = {c: [] for c in columns}
+        self.rows = 0
+        self.schema = schema
+
+        if schema is not None:
+            self.writer = pq.ParquetWriter(path, schema)
+            self.fh = None
+        else:
+            self.writer = None
+            self.fh = open(path, "w")
+            self.fh.write(json.dumps({"format": "columnar-v1", "columns": columns}) + "\n")
+
+    def append(self, row):
+        for column, value in zip(self.columns, row):
+            self.buffer[column].append(value)
+        self.rows += 1
+        if self.rows >= self.row_group_size:
+            self.flush()
+
+    def flush(self):
+        if not self.rows:
+            return
+        if self.writer is not None:
+            self.writer.write_table(pa.table(self.buffer, schema=self.schema))
+        else:
+            self.fh.write(json.dumps(self.buffer) + "\n")
+        self.buffer = {c: [] for c in self.columns}
+        self.rows = 0
+
+    def close(self):
+        self.flush()
+        if self.writer is not None:
+            self.writer.close()
+        else:
+            self.fh.close()
+
+
+def _read_row_groups(path):
+    # yields dicts of column -> list, one per row group
+    if path.endswith(".parquet"):
+        parquet_file = pq.ParquetFile(path)
+        for i in range(parquet_file.num_row_groups):
+            yield parquet_file.read_row_group(i).to_pydict()
+        return
+
+    with open(path, "r") as f:
+        header = json.loads(f.readline())
+        if header.get("format") != "columnar-v1":
+            raise ValueError(f"Unsupported columnar file: {path}")
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def export_columnar(base, students_dict, row_group_size=ROW_GROUP_SIZE):
+    use_parquet = pa is not None
+    grades_path, summary_path = _columnar_paths(base, use_parquet)
+
+    grades_schema = summary_schema = None
+    if use_parquet:
+        grades_schema = pa.schema([
+            ("name", pa.string()),
+            ("grade_index", pa.int32()),
+            ("grade", pa.float64()),
+        ])
+        summary_schema = pa.schema([
+            ("name", pa.string()),
+            ("count", pa.int32()),
+            ("average", pa.float64()),
+            ("highest", pa.float64()),
+            ("lowest", pa.float64()),
+            ("median", pa.float64()),
+        ])
+
+    grades_out = _ColumnarWriter(grades_path, GRADE_COLUMNS, grades_schema, row_group_size)
+    summary_out = _ColumnarWriter(summary_path, SUMMARY_COLUMNS, summary_schema, row_group_size)
+    try:
+        for student in students_dict.values():
+            for i, g in enumerate(student.grades):
+                grades_out.append((student.name, i, g))
+
+            summary_out.append((
+                student.name,
+                len(student.grades),
+                student.average() if student.grades else None,
+                student.highest(),
+                student.lowest(),
+                student.median(),
+            ))
+    finally:
+        grades_out.close()
+        summary_out.close()
+
+    print(f"Columnar snapshot exported to {grades_path} and {summary_path}")
+    return grades_path, summary_path
+
+
+def import_columnar(base, StudentClass):
+    parquet_paths = _columnar_paths(base, True)
+    if pa is not None and os.path.exists(parquet_paths[0]):
+        grades_path, summary_path = parquet_paths
+    else:
+        grades_path, summary_path = _columnar_paths(base, False)
+
+    try:
+        grades_by_name = {}
+
+        # summary first, so students without grades survive the round trip
+        for group in _read_row_groups(summary_path):
+            for name in group["name"]:
+                grades_by_name[name] = {}
+
+        for group in _read_row_groups(grades_path):
+            for name, i, g in zip(group["name"], group["grade_index"], group["grade"]):
+                grades_by_name.setdefault(name, {})[i] = g
+
+        students = {}
+        dropped = 0
+        for name, indexed in grades_by_name.items():
+            # same checks as load_from_json, in case the snapshot was edited by hand
+            grades, bad = _normalize_grades([indexed[i] for i in sorted(indexed)])
+            for i, g in bad:
+                print(f"  {name}: dropped grade #{i} {g!r} (not a number in 0-100)")
+            dropped += len(bad)
+            students[name] = StudentClass(name, grades)
+
+        if dropped:
+            print(f"{dropped} invalid grade(s) dropped from the snapshot.")
+        print(f"Columnar snapshot loaded from {grades_path}")
+        return students
+
+    except FileNotFoundError:
+        print("Columnar snapshot not found.")
+        return None
+
+    except (ValueError, KeyError, TypeError, json.JSONDecodeError) as e:
+        print(f"Error reading columnar snapshot: {e}")
+        return None
@@ -4,9 +4,14 @@ from tkinter import ttk, messagebox, simpledialog, filedialog
 import ttkbootstrap as tb
 from ttkbootstrap.constants import *
 from student_grade_analyzer import GradeAnalyzer, Student
+from utils import parse_bulk_grades
+from data_manager import export_columnar, quarantine_path
 import json
 import os
 
+# minimum delay between histogram redraws, so rapid edits collapse into one
+HISTOGRAM_REDRAW_MS = 150
+
 # ---------- Helper dialogs ----------
 def ask_string(title, prompt, parent=None, initialvalue=""):
     return simpledialog.askstring(title, prompt, parent=parent, initialvalue=initialvalue)
@@ -25,16 +30,16 @@ class GradeAnalyzerGUI:
     def __init__(self, root):
         self.analyzer = GradeAnalyzer()
 
-        # Auto-load on start (silent)
+        # Auto-load on start; problems are reported once the window is up
         try:
             self.analyzer.import_json()
         except Exception:
-            # If import_json fails for some reason, ignore and continue with empty dataset
-            pass
+            # unexpected failure: continue with an empty dataset, but never autosave it over the file
+            self.analyzer.load_failed = os.path.exists("students_data.json")
 
         self.root = root
         self.root.title("Student Grade Analyzer — Phase 3")
-        self.root.geometry("1000x600")
+        self.root.geometry("1000x720")
         self.root.protocol("WM_DELETE_WINDOW", self.on_quit)  # ensure autosave on close
 
         # Layout frames
@@ -49,6 +54,29 @@ class GradeAnalyzerGUI:
         self._build_action_buttons()
 
         self.refresh_student_list()
+        self.root.after(200, self._report_load_problems)
+
+    def _report_load_problems(self):
+        # the auto-load only prints to stdout; make sure a GUI user sees it too
+        if self.analyzer.load_failed:
+            messagebox.showerror(
+                "Load failed",
+                "students_data.json could not be loaded (see the console for details).\n\n"
+                "Autosave is off so the file is not overwritten. Fix the file and restart.",
+            )
+            return
+        errors = self.analyzer.load_errors
+        if not errors:
+            return
+        shown = "\n".join(errors[:15])
+        if len(errors) > 15:
+            shown += f"\n... and {len(errors) - 15} more"
+        messagebox.showwarning(
+            "Data problems",
+            f"{len(errors)} problem(s) were found in students_data.json:\n\n{shown}\n\n"
+            f"Affected records were not loaded and were moved to "
+            f"{quarantine_path('students_data.json')}.",
+        )
 
     # ---------- Top bar (search + global actions) ----------
     def _build_top_bar(self):
@@ -126,6 +154,9 @@ class GradeAnalyzerGUI:
         del_grade_btn = ttk.Button(grade_btns, text="Delete Grade", command=self.on_delete_grade, bootstyle="danger")
         del_grade_btn.grid(row=0, column=2, padx=6, pady=4)
 
+        bulk_grade_btn = ttk.Button(grade_btns, text="Bulk Add Grades...", bootstyle="secondary", command=self.on_bulk_add_grades)
+        bulk_grade_btn.grid(row=0, column=3, padx=6, pady=4)
+
         # Statistics
         stats_frame = ttk.Frame(right)
         stats_frame.pack(fill=X, pady=(8, 4))
@@ -139,6 +170,26 @@ class GradeAnalyzerGUI:
         self.med_lbl = ttk.Label(stats_frame, text="Median: -")
         self.med_lbl.pack(anchor="w")
 
+        # Grade distribution (cohort + selected student)
+        hist_frame = ttk.Frame(right)
+        hist_frame.pack(fill=BOTH, expand=True, pady=(8, 4))
+        hist_frame.columnconfigure(0, weight=1)
+        hist_frame.columnconfigure(1, weight=1)
+        hist_frame.rowconfigure(1, weight=1)
+
+        ttk.Label(hist_frame, text="Cohort distribution").grid(row=0, column=0, sticky="w")
+        ttk.Label(hist_frame, text="Student distribution").grid(row=0, column=1, sticky="w")
+
+        self.cohort_canvas = tk.Canvas(hist_frame, height=150, background="white", highlightthickness=0)
+        self.cohort_canvas.grid(row=1, column=0, sticky="nsew", padx=(0, 4))
+        self.student_canvas = tk.Canvas(hist_frame, height=150, background="white", highlightthickness=0)
+        self.student_canvas.grid(row=1, column=1, sticky="nsew", padx=(4, 0))
+
+        self._hist_student = None
+        self._hist_redraw_pending = False
+        self.cohort_canvas.bind("<Configure>", lambda e: self.schedule_histogram_redraw())
+        self.student_canvas.bind("<Configure>", lambda e: self.schedule_histogram_redraw())
+
     # ---------- Bottom action buttons ----------
     def _build_action_buttons(self):
         btn_bar = ttk.Frame(self.root, padding=(8, 8))
@@ -159,6 +210,9 @@ class GradeAnalyzerGUI:
         export_csv_btn = ttk.Button(btn_bar, text="Export CSV", bootstyle="secondary", command=self.on_export_csv)
         export_csv_btn.pack(side=LEFT, padx=6)
 
+        export_cols_btn = ttk.Button(btn_bar, text="Export Columnar", bootstyle="secondary", command=self.on_export_columnar)
+        export_cols_btn.pack(side=LEFT, padx=6)
+
         refresh_btn = ttk.Button(btn_bar, text="Refresh", bootstyle="light", command=self.refresh_student_list)
         refresh_btn.pack(side=RIGHT, padx=6)
 
@@ -188,6 +242,16 @@ class GradeAnalyzerGUI:
         self.high_lbl.config(text="Highest: -")
         self.low_lbl.config(text="Lowest: -")
         self.med_lbl.config(text="Median: -")
+        self._hist_student = None
+        self.schedule_histogram_redraw()
+
+    def update_student_row(self, name):
+        # incremental alternative to refresh_student_list for a single row
+        student = self.analyzer.students.get(name)
+        if student is None or not self.tree.exists(name):
+            return
+        avg_str = f"{student.average():.2f}" if student.grades else "-"
+        self.tree.item(name, values=(name, avg_str, len(student.grades)))
 
     def get_selected_student_name(self):
         sel = self.tree.selection()
@@ -240,6 +304,52 @@ class GradeAnalyzerGUI:
             self.low_lbl.config(text="Lowest: -")
             self.med_lbl.config(text="Median: -")
 
+        self._hist_student = student
+        self.schedule_histogram_redraw()
+
+    # ---------- Histograms ----------
+    def schedule_histogram_redraw(self):
+        # throttle: any number of calls within the window result in a single redraw
+        if self._hist_redraw_pending:
+            return
+        self._hist_redraw_pending = True
+        self.root.after(HISTOGRAM_REDRAW_MS, self._redraw_histograms)
+
+    def _redraw_histograms(self):
+        self._hist_redraw_pending = False
+        self._draw_histogram(self.cohort_canvas, self.analyzer.histogram, "#4a7ebb")
+        student_hist = self._hist_student.histogram if self._hist_student else None
+        self._draw_histogram(self.student_canvas, student_hist, "#5cb85c")
+
+    def _draw_histogram(self, canvas, histogram, color):
+        canvas.delete("all")
+        width = canvas.winfo_width()
+        height = canvas.winfo_height()
+        if width <= 1 or height <= 1:
+            return
+
+        if histogram is None or histogram.total == 0:
+            canvas.create_text(width / 2, height / 2, text="No grades", fill="gray")
+            return
+
+        pad_top, pad_bottom, pad_x = 14, 18, 4
+        counts = histogram.counts
+        labels = histogram.labels()
+        peak = max(counts)
+        bar_w = (width - 2 * pad_x) / len(counts)
+        usable_h = height - pad_top - pad_bottom
+
+        for i, c in enumerate(counts):
+            x0 = pad_x + i * bar_w
+            x1 = x0 + bar_w - 2
+            y1 = height - pad_bottom
+            y0 = y1 - (usable_h * c / peak if peak else 0)
+            canvas.create_rectangle(x0, y0, x1, y1, fill=color, outline="")
+            if c:
+                canvas.create_text((x0 + x1) / 2, y0 - 6, text=str(c), font=("Segoe UI", 7))
+            canvas.create_text((x0 + x1) / 2, height - pad_bottom / 2,
+                               text=labels[i].split("-")[0], font=("Segoe UI", 7))
+
     # ---------- CRUD operations ----------
     def on_add_student(self):
         name = ask_string("Add Student", "Student name:", parent=self.root)
@@ -289,7 +399,8 @@ class GradeAnalyzerGUI:
         answer = messagebox.askyesno("Confirm", f"Are you sure you want to remove '{name}'?")
         if not answer:
             return
-        self.analyzer.students.pop(name, None)
+        if name in self.analyzer.students:
+            self.analyzer.delete_student(name)
         self._autosave()
         self.refresh_student_list()
 
@@ -309,7 +420,7 @@ class GradeAnalyzerGUI:
         if student is None:
             messagebox.showerror("Error", "Selected student not found.")
             return
-        student.add_grade(value)
+        self.analyzer.add_grade(name, value)
         self._autosave()
         self.show_student_details(name)
         self.refresh_student_list()
@@ -335,7 +446,7 @@ class GradeAnalyzerGUI:
         if not (0 <= new_value <= 100):
             messagebox.showwarning("Invalid", "Grade must be between 0 and 100.")
             return
-        student.grades[sel_index] = new_value
+        self.analyzer.update_grade(name, sel_index, new_value)
         self._autosave()
         self.show_student_details(name)
         self.refresh_student_list()
@@ -361,11 +472,70 @@ class GradeAnalyzerGUI:
         confirm = messagebox.askyesno("Confirm", f"Delete grade #{sel_index+1} ({student.grades[sel_index]}) for {name}?")
         if not confirm:
             return
-        student.grades.pop(sel_index)
+        self.analyzer.remove_grade(name, sel_index)
         self._autosave()
         self.show_student_details(name)
         self.refresh_student_list()
 
+    # ---------- Bulk grade entry ----------
+    def on_bulk_add_grades(self):
+        win = tk.Toplevel(self.root)
+        win.title("Bulk Add Grades")
+        win.geometry("420x420")
+        win.transient(self.root)
+
+        ttk.Label(
+            win,
+            text="One 'name, grade' per line (tab-separated rows pasted from a spreadsheet work too):",
+            wraplength=400,
+        ).pack(anchor="w", padx=8, pady=(8, 4))
+
+        text = tk.Text(win, height=16, wrap="none")
+        text.pack(fill=BOTH, expand=True, padx=8)
+
+        btns = ttk.Frame(win, padding=8)
+        btns.pack(fill=X)
+
+        def paste_clipboard():
+            try:
+                text.insert(tk.END, self.root.clipboard_get())
+            except tk.TclError:
+                messagebox.showinfo("Clipboard", "Clipboard is empty.", parent=win)
+
+        def apply():
+            entries, errors = parse_bulk_grades(text.get("1.0", tk.END), self.analyzer.students)
+            if errors:
+                shown = "\n".join(errors[:15])
+                if len(errors) > 15:
+                    shown += f"\n... and {len(errors) - 15} more"
+                messagebox.showwarning("Invalid entries", f"Nothing was added. Fix these lines:\n\n{shown}", parent=win)
+                return
+            if not entries:
+                messagebox.showinfo("Bulk Add", "No grades to add.", parent=win)
+                return
+            self.apply_bulk_grades(entries)
+            win.destroy()
+            messagebox.showinfo("Bulk Add", f"Added {len(entries)} grades.")
+
+        ttk.Button(btns, text="Paste from clipboard", command=paste_clipboard).pack(side=LEFT)
+        ttk.Button(btns, text="Cancel", bootstyle="secondary", command=win.destroy).pack(side=RIGHT)
+        ttk.Button(btns, text="Validate & Add", bootstyle="success", command=apply).pack(side=RIGHT, padx=6)
+
+        text.focus_set()
+
+    def apply_bulk_grades(self, entries):
+        # one batch: a single save and only the affected rows are redrawn
+        touched = self.analyzer.apply_grades(entries)
+        self._autosave()
+        for name in touched:
+            self.update_student_row(name)
+
+        selected = self.get_selected_student_name()
+        if selected in touched:
+            self.show_student_details(selected)
+        else:
+            self.schedule_histogram_redraw()
+
     # ---------- Exports ----------
     def on_export_txt(self):
         try:
@@ -417,6 +587,18 @@ class GradeAnalyzerGUI:
         except Exception as e:
             messagebox.showerror("Export Error", str(e))
 
+    def on_export_columnar(self):
+        try:
+            fname = filedialog.asksaveasfilename(title="Save columnar snapshot (base name)", initialfile="students_snapshot")
+            if not fname:
+                return
+            # writes <base>_grades and <base>_summary (.parquet with pyarrow, .cols.jsonl otherwise)
+            base = os.path.splitext(fname)[0]
+            grades_path, summary_path = export_columnar(base, self.analyzer.students)
+            messagebox.showinfo("Export", f"Columnar snapshot saved to:\n{grades_path}\n{summary_path}")
+        except Exception as e:
+            messagebox.showerror("Export Error", str(e))
+
     def on_export_dialog(self):
         # small chooser to pick txt or csv (user friendly)
         choice = messagebox.askquestion("Export", "Export as CSV? (No = TXT)")
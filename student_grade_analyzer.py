@@ -1,15 +1,39 @@
+import os
 import statistics
-from data_manager import save_to_json, load_from_json
-from utils import search_students
+from data_manager import VALIDATION_MODES, quarantine_path, save_to_json, load_from_json, export_columnar, import_columnar
+from utils import search_students, GradeHistogram
 
 
 class Student:
     def __init__(self, name, grades=None):
         self.name = name
         self.grades = grades if grades is not None else []
+        self._histogram = None
+
+    @property
+    def histogram(self):
+        # built on first use, so loading many students doesn't pay for it
+        if self._histogram is None:
+            self._histogram = GradeHistogram(self.grades)
+        return self._histogram
 
     def add_grade(self, grade):
         self.grades.append(grade)
+        if self._histogram is not None:
+            self._histogram.add(grade)
+
+    def update_grade(self, index, grade):
+        old_grade = self.grades[index]
+        self.grades[index] = grade
+        if self._histogram is not None:
+            self._histogram.replace(old_grade, grade)
+        return old_grade
+
+    def remove_grade(self, index):
+        grade = self.grades.pop(index)
+        if self._histogram is not None:
+            self._histogram.remove(grade)
+        return grade
 
     def average(self):
         return sum(self.grades) / len(self.grades) if self.grades else 0
@@ -30,10 +54,51 @@ class Student:
 class GradeAnalyzer:
     def __init__(self):
         self.students = {}
+        self.histogram = GradeHistogram()
+        self.load_errors = []
+        self.load_failed = False
     
     def autosave(self):
+        if self.load_failed:
+            # the data file exists but couldn't be loaded: don't replace it with an empty dataset
+            print("Autosave skipped: students_data.json could not be loaded. Fix it and import again.")
+            return
         save_to_json("students_data.json", self.students)
 
+    def rebuild_histogram(self):
+        # one bulk pass over every grade, without building per-student histograms
+        self.histogram.clear()
+        self.histogram.add_many([g for s in self.students.values() for g in s.grades])
+
+    # Grade changes go through these so the student and cohort histograms
+    # never drift apart.
+    def add_grade(self, name, grade):
+        self.students[name].add_grade(grade)
+        self.histogram.add(grade)
+
+    def update_grade(self, name, index, grade):
+        old_grade = self.students[name].update_grade(index, grade)
+        self.histogram.replace(old_grade, grade)
+        return old_grade
+
+    def remove_grade(self, name, index):
+        grade = self.students[name].remove_grade(index)
+        self.histogram.remove(grade)
+        return grade
+
+    def delete_student(self, name):
+        student = self.students.pop(name)
+        self.histogram.subtract(student.histogram)
+        return student
+
+    def apply_grades(self, entries):
+        # entries must already be validated (see utils.parse_bulk_grades)
+        touched = set()
+        for name, grade in entries:
+            self.add_grade(name, grade)
+            touched.add(name)
+        return touched
+
 
     def add_student(self):
         name = input("Enter student name: ").strip()
@@ -53,13 +118,13 @@ class GradeAnalyzer:
 
         try:
             grade = float(input("Enter grade (0-100): "))
-            if grade < 0 or grade > 100:
+            if not (0 <= grade <= 100):
                 raise ValueError
         except ValueError:
             print("Invalid grade.")
             return
 
-        self.students[name].add_grade(grade)
+        self.add_grade(name, grade)
         print(f"Added grade {grade} to {name}")
         self.autosave()
 
@@ -87,7 +152,7 @@ class GradeAnalyzer:
             print("Student not found.")
             return
 
-        del self.students[name]
+        self.delete_student(name)
         print(f"Removed student {name}")
         self.autosave()
 
@@ -162,11 +227,36 @@ class GradeAnalyzer:
         filename = "students_data.json"
         save_to_json(filename, self.students)
 
-    def import_json(self):
+    def import_json(self, mode="quarantine"):
         filename = "students_data.json"
-        data = load_from_json(filename, Student)
+        self.load_errors = []
+        data = load_from_json(filename, Student, mode=mode, errors=self.load_errors)
+        if data is not None:
+            self.students = data
+            self.rebuild_histogram()
+            self.load_failed = False
+        elif os.path.exists(filename) and not self.students:
+            self.load_failed = True
+
+    def import_json_with_mode(self):
+        print("Validation modes:")
+        print("  quarantine - load good records, move bad ones to students_data_quarantine.json (default)")
+        print("  lenient    - load what can be salvaged, drop the rest")
+        print("  strict     - load nothing if any record has a problem")
+        mode = input("Mode [quarantine]: ").strip().lower() or "quarantine"
+        if mode not in VALIDATION_MODES:
+            print("Invalid mode.")
+            return
+        self.import_json(mode)
+
+    def export_columnar(self):
+        export_columnar("students_snapshot", self.students)
+
+    def import_columnar(self):
+        data = import_columnar("students_snapshot", Student)
         if data is not None:
             self.students = data
+            self.rebuild_histogram()
 
     def search_student(self):
         query = input("Search student by name: ").strip()
@@ -195,6 +285,8 @@ STUDENT GRADE ANALYZER
 9. Search student
 10. Export all data to JSON
 11. Import all data from JSON
+13. Export columnar snapshot
+14. Import columnar snapshot
 12. Exit
 """)
 
@@ -221,10 +313,14 @@ STUDENT GRADE ANALYZER
             elif choice == "10":
                 self.export_json()
             elif choice == "11":
-                self.import_json()
+                self.import_json_with_mode()
             elif choice == "12":
                 print("Goodbye!")
                 break
+            elif choice == "13":
+                self.export_columnar()
+            elif choice == "14":
+                self.import_columnar()
             else:
                 print("Invalid option. Try again.")
 
@@ -1,3 +1,8 @@
+import operator
+from collections import Counter
+from itertools import repeat
+
+
 def search_students(query, students_dict):
     query = query.lower()
     results = []
@@ -7,3 +12,135 @@ def search_students(query, students_dict):
             results.append(name)
 
     return results
+
+
+BULK_HEADER_NAMES = {"grade", "grades", "score", "scores", "mark", "marks"}
+
+
+def parse_bulk_grades(text, students_dict):
+    """Parse and validate many "name, grade" lines in one pass.
+
+    Returns (entries, errors): entries is a list of (name, grade) pairs,
+    errors a list of human-readable messages with line numbers. Tab-separated
+    lines (pasted from a spreadsheet) are accepted as well, and a header row
+    such as "name, grade" on the first line is skipped.
+    """
+    entries = []
+    errors = []
+    first = True
+
+    for lineno, line in enumerate(text.splitlines(), start=1):
+        line = line.strip()
+        if not line:
+            continue
+        is_first, first = first, False
+
+        sep = "\t" if "\t" in line else ","
+        if sep not in line:
+            errors.append(f"Line {lineno}: expected 'name, grade'")
+            continue
+
+        name, raw_grade = line.rsplit(sep, 1)
+        name = name.strip()
+        raw_grade = raw_grade.strip()
+
+        if is_first and raw_grade.lower() in BULK_HEADER_NAMES:
+            continue
+
+        if name not in students_dict:
+            errors.append(f"Line {lineno}: unknown student '{name}'")
+            continue
+
+        try:
+            grade = float(raw_grade)
+        except ValueError:
+            errors.append(f"Line {lineno}: invalid grade '{raw_grade}'")
+            continue
+
+        if not (0 <= grade <= 100):
+            errors.append(f"Line {lineno}: grade {grade} out of range (0-100)")
+            continue
+
+        entries.append((name, grade))
+
+    return entries, errors
+
+
+NUMERIC_TYPES = {int, float}
+
+
+class GradeHistogram:
+    """Bucket counts for grades in the 0-100 range.
+
+    Counts are updated incrementally as grades are added, edited or removed,
+    so reading them back is O(bins) no matter how many grades there are.
+    """
+
+    def __init__(self, grades=None, bin_width=10, low=0, high=100):
+        self.bin_width = bin_width
+        self.low = low
+        self.high = high
+        num_bins = -(-(high - low) // bin_width)
+        self.counts = [0] * num_bins
+        self.total = 0
+
+        if grades:
+            self.add_many(grades)
+
+    def add_many(self, grades):
+        # bulk update: count raw bin keys with Counter, then clamp the few distinct keys
+        if not set(map(type, grades)) <= NUMERIC_TYPES:
+            grades = [g for g in grades if type(g) in NUMERIC_TYPES]
+        if self.low:
+            grades = [g - self.low for g in grades]
+        keys = Counter(map(operator.floordiv, grades, repeat(self.bin_width)))
+        last = len(self.counts) - 1
+        for key, c in keys.items():
+            if key != key:  # NaN
+                continue
+            self.counts[int(min(max(key, 0), last))] += c
+            self.total += c
+
+    def bucket(self, grade):
+        # the top edge (100) belongs to the last bin; anything outside is clamped.
+        # Non-numeric values, NaN and inf (inf // n is NaN) have no bin: None.
+        if type(grade) not in NUMERIC_TYPES:
+            return None
+        key = (grade - self.low) // self.bin_width
+        if key != key:
+            return None
+        return int(min(max(key, 0), len(self.counts) - 1))
+
+    def add(self, grade):
+        index = self.bucket(grade)
+        if index is None:
+            return
+        self.counts[index] += 1
+        self.total += 1
+
+    def remove(self, grade):
+        index = self.bucket(grade)
+        if index is not None and self.counts[index] > 0:
+            self.counts[index] -= 1
+            self.total -= 1
+
+    def replace(self, old_grade, new_grade):
+        self.remove(old_grade)
+        self.add(new_grade)
+
+    def subtract(self, other):
+        for i, c in enumerate(other.counts):
+            self.counts[i] = max(self.counts[i] - c, 0)
+        self.total = sum(self.counts)
+
+    def clear(self):
+        self.counts = [0] * len(self.counts)
+        self.total = 0
+
+    def labels(self):
+        labels = []
+        for i in range(len(self.counts)):
+            start = self.low + i * self.bin_width
+            end = min(start + self.bin_width, self.high)
+            labels.append(f"{start}-{end}")
+        return labels